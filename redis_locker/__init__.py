@@ -1 +1,2 @@
 from ._locker import *
+from ._async_locker import *
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Protocol
+from redis.asyncio import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import NoScriptError
+from ._locker import _ACQUIRE_LUA, _MAX_POLL_MS, _RELEASE_TOUCH_LUA, _new_uuid
+
+
+__all__ = ["AsyncRedisLock", "AsyncRedisLocker"]
+
+
+_ACQUIRE_SCRIPT = AsyncScript(None, _ACQUIRE_LUA.encode())
+_RELEASE_TOUCH_SCRIPT = AsyncScript(None, _RELEASE_TOUCH_LUA.encode())
+
+
+class AsyncRedisLock(Protocol):
+    __slots__ = ()
+
+    async def touch(self, ttl_ms: int) -> bool:
+        """
+        Extend the lock's time-to-live (TTL) by the specified milliseconds.
+        Returns True if the TTL was successfully extended, False otherwise.
+        """
+        ...
+
+    @property
+    def key(self) -> str: ...
+
+    @property
+    def uuid(self) -> str: ...
+
+    @property
+    def uuid_bytes(self) -> bytes:
+        """The token as stored in Redis."""
+        ...
+
+
+class _AsyncRedisLock(AsyncRedisLock):
+    __slots__ = ("_locker", "_key", "_uuid")
+
+    def __init__(self, locker: "AsyncRedisLocker", key: str, uuid: str | bytes):
+        self._locker = locker
+        self._key = key
+        self._uuid = uuid
+
+    async def touch(self, ttl_ms: int) -> bool:
+        return await self.locker._touch(self.key, self._uuid, ttl_ms)
+
+    @property
+    def key(self) -> str:
+        return self._key
+
+    @property
+    def uuid(self) -> str:
+        return self._uuid.hex() if isinstance(self._uuid, bytes) else self._uuid
+
+    @property
+    def uuid_bytes(self) -> bytes:
+        return self._uuid if isinstance(self._uuid, bytes) else self._uuid.encode()
+
+    @property
+    def locker(self) -> "AsyncRedisLocker":
+        return self._locker
+
+
+class AsyncRedisLocker:
+    def __init__(
+        self, redis: Redis | None = None, *, connection_pool: ConnectionPool | None = None
+    ):
+        """
+        Build the locker on an existing client, or on a new client backed by
+        connection_pool so concurrent tasks do not share a single connection.
+        """
+        if redis is None:
+            if connection_pool is None:
+                raise ValueError("Either redis or connection_pool must be given")
+            redis = Redis(connection_pool=connection_pool)
+        self.redis = redis
+        self._execute_command = redis.execute_command
+        self._binary_uuids = not redis.get_encoder().decode_responses
+
+    async def _evalsha(self, script: AsyncScript, key: str, *args):
+        try:
+            return await self._execute_command("EVALSHA", script.sha, 1, key, *args)
+        except NoScriptError:
+            await self.redis.script_load(script.script)
+            return await self._execute_command("EVALSHA", script.sha, 1, key, *args)
+
+    async def _acquire(
+        self, key: str, ttl_ms: int, *, uuid: str | bytes | None = None
+    ) -> tuple[str | bytes, None] | tuple[None, int]:
+        uuid = uuid or _new_uuid(self._binary_uuids)
+        pttl = await self._evalsha(_ACQUIRE_SCRIPT, key, uuid, ttl_ms)
+        if pttl is None:
+            return uuid, None
+        return None, pttl
+
+    async def _release(self, key: str, uuid: str | bytes) -> bool:
+        result = await self._evalsha(_RELEASE_TOUCH_SCRIPT, key, uuid, "d")
+        return result is not None
+
+    async def _touch(self, key: str, uuid: str | bytes, ttl_ms: int) -> bool:
+        result = await self._evalsha(_RELEASE_TOUCH_SCRIPT, key, uuid, ttl_ms)
+        return result is not None
+
+    async def _acquire_within(
+        self, key: str, ttl_ms: int, blocking_ms: int | None
+    ) -> tuple[str | bytes, None] | tuple[None, int]:
+        uuid, pttl = await self._acquire(key, ttl_ms)
+        if uuid is not None or blocking_ms is None:
+            return uuid, pttl
+        deadline = time.monotonic() + blocking_ms / 1000
+        while uuid is None:
+            budget_ms = (deadline - time.monotonic()) * 1000
+            if budget_ms <= 0:
+                break
+            poll_ms = _MAX_POLL_MS if pttl < 0 else min(pttl, _MAX_POLL_MS)
+            await asyncio.sleep(min(poll_ms, budget_ms) / 1000)
+            uuid, pttl = await self._acquire(key, ttl_ms)
+        return uuid, pttl
+
+    @asynccontextmanager
+    async def lock(
+        self, key: str, ttl_ms: int, *, blocking_ms: int | None = None
+    ) -> AsyncGenerator[AsyncRedisLock]:
+        """
+        Acquire the lock for the duration of the context.
+        With blocking_ms, retry for up to that many milliseconds, polling every
+        50 ms or when the holder's TTL runs out, whichever comes first.
+        """
+        uuid, pttl = await self._acquire_within(key, ttl_ms, blocking_ms)
+        if uuid is None:
+            raise RuntimeError(f"Failed to acquire lock {key!r} (held for another {pttl} ms)")
+
+        try:
+            yield _AsyncRedisLock(self, key, uuid)
+        finally:
+            await self._release(key, uuid)
+
+    @asynccontextmanager
+    async def try_lock(
+        self, key: str, ttl_ms: int, *, blocking_ms: int | None = None
+    ) -> AsyncGenerator[AsyncRedisLock | None]:
+        """
+        Like lock, but yield None instead of raising RuntimeError when the lock
+        cannot be acquired.
+        """
+        uuid, _ = await self._acquire_within(key, ttl_ms, blocking_ms)
+        if uuid is None:
+            yield None
+            return
+
+        try:
+            yield _AsyncRedisLock(self, key, uuid)
+        finally:
+            await self._release(key, uuid)
+
+    @asynccontextmanager
+    async def __call__(
+        self, key: str, ttl_ms: int, *, blocking_ms: int | None = None
+    ) -> AsyncGenerator[AsyncRedisLock]:
+        async with self.lock(key, ttl_ms, blocking_ms=blocking_ms) as lock:
+            yield lock
@@ -1,13 +1,253 @@
-from contextlib import contextmanager
-from uuid import uuid4
-from typing import Generator, Protocol
+import atexit
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+import warnings
+from contextlib import AbstractContextManager, contextmanager
+from queue import SimpleQueue
+from typing import Callable, Generator, Protocol
+from weakref import WeakKeyDictionary, WeakSet, WeakValueDictionary
 from redis import Redis
+from redis.commands.core import Script
+from redis.exceptions import NoScriptError
 
 
 __all__ = ["RedisLock", "RedisLocker", "RedisLockerKey"]
 
 
+logger = logging.getLogger(__name__)
+
+
+_ACQUIRE_LUA = """
+if redis.call("set", KEYS[1], ARGV[1], "NX", "PX", ARGV[2]) then
+    return false
+end
+return redis.call("pttl", KEYS[1])
+"""
+
+# Releases the lock when ARGV[2] is "d", otherwise sets its TTL to ARGV[2] ms.
+# Replies 1 on success and nil otherwise.
+_RELEASE_TOUCH_LUA = """
+if redis.call("get", KEYS[1]) ~= ARGV[1] then
+    return false
+end
+if ARGV[2] == "d" then
+    return redis.call("del", KEYS[1]) == 1
+end
+return redis.call("pexpire", KEYS[1], tonumber(ARGV[2])) == 1
+"""
+
+# Scripts are built from bytes so they are not bound to a client; every call
+# passes its client explicitly, so all lockers share these instances.
+_ACQUIRE_SCRIPT = Script(None, _ACQUIRE_LUA.encode())
+_RELEASE_TOUCH_SCRIPT = Script(None, _RELEASE_TOUCH_LUA.encode())
+
+# Clients created by RedisLocker.from_url, keyed by URL and client options.
+_URL_CLIENTS: dict[tuple, Redis] = {}
+_URL_CLIENTS_LOCK = threading.Lock()
+
+# Live lockers per client. Many lockers on one client usually means lockers
+# are being created per call instead of shared.
+_CLIENT_LOCKERS: "WeakKeyDictionary[Redis, WeakSet[RedisLocker]]" = WeakKeyDictionary()
+_MAX_LOCKERS_PER_CLIENT = 32
+
+# Lockers backing RedisLockerKey(redis, key), one per live client. Keyed by
+# id() because each locker keeps its client alive, so the id cannot be reused.
+_SHARED_LOCKERS: "WeakValueDictionary[int, RedisLocker]" = WeakValueDictionary()
+
+# Upper bound on memoized RedisLockerKey objects per locker.
+_KEY_CACHE_SIZE = 1024
+
+# Maximum number of queued releases sent in one pipeline.
+_RELEASE_BATCH_SIZE = 64
+
+# Longest sleep between attempts while blocking, so a release before the
+# holder's TTL runs out is noticed promptly.
+_MAX_POLL_MS = 50
+
+
+def _new_uuid(binary: bool = False) -> str | bytes:
+    """
+    Generate a random lock token: 16 raw bytes when binary, otherwise their hex
+    form, which is needed for clients that decode responses as text.
+    """
+    token = os.urandom(16)
+    return token if binary else token.hex()
+
+
+def _release_pipelined(redis: Redis, locks: list[tuple[str, str | bytes]]) -> None:
+    """
+    Release locks in one pipeline. EVALSHA is queued directly rather than via
+    Script, which would make the pipeline send SCRIPT EXISTS first; releases
+    that hit NOSCRIPT are resent after reloading the script.
+    """
+    sha = _RELEASE_TOUCH_SCRIPT.sha
+    pipe = redis.pipeline(transaction=False)
+    for key, uuid in locks:
+        pipe.execute_command("EVALSHA", sha, 1, key, uuid, "d")
+    results = pipe.execute(raise_on_error=False)
+
+    missing = [lock for lock, result in zip(locks, results) if isinstance(result, NoScriptError)]
+    if missing:
+        redis.script_load(_RELEASE_TOUCH_SCRIPT.script)
+        for key, uuid in missing:
+            pipe.execute_command("EVALSHA", sha, 1, key, uuid, "d")
+        pipe.execute()
+    for result in results:
+        if isinstance(result, Exception) and not isinstance(result, NoScriptError):
+            raise result
+
+
+class _Releaser:
+    """
+    Sends fire-and-forget releases for all lockers from one background thread.
+    Each batch is grouped by client and sent as one pipeline per client.
+    Releases still queued at interpreter exit are sent before shutdown.
+    """
+
+    def __init__(self):
+        self._queue: SimpleQueue[tuple[Redis, str, str | bytes, threading.Event]] = SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def put(self, redis: Redis, key: str, uuid: str | bytes) -> threading.Event:
+        """
+        Queue a release. The returned event is set once it has been sent,
+        whether or not it succeeded.
+        """
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="redis-locker-release", daemon=True
+                    )
+                    self._thread.start()
+                    atexit.register(self.flush)
+        done = threading.Event()
+        self._queue.put((redis, key, uuid, done))
+        return done
+
+    def flush(self) -> None:
+        """Send every queued release from the calling thread."""
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        self._send(batch)
+
+    def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [queue.get()]
+            while len(batch) < _RELEASE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            self._send(batch)
+            # Do not keep the last clients alive while waiting for more work.
+            del batch
+
+    @staticmethod
+    def _send(batch: list[tuple[Redis, str, str | bytes, threading.Event]]) -> None:
+        by_client: dict[Redis, list[tuple[str, str | bytes]]] = {}
+        for redis, key, uuid, _ in batch:
+            by_client.setdefault(redis, []).append((key, uuid))
+        try:
+            for redis, locks in by_client.items():
+                try:
+                    _release_pipelined(redis, locks)
+                except Exception:
+                    logger.exception(
+                        "Failed to release %d lock(s); they will expire through their TTL",
+                        len(locks),
+                    )
+        finally:
+            for *_, done in batch:
+                done.set()
+
+
+_RELEASER = _Releaser()
+
+
+class _Watchdog:
+    """
+    Periodically renews held locks. A single scheduler thread tracks due times
+    and hands renewals to a few shared worker threads, so holding many locks
+    does not cost a thread per lock. The workers are plain daemon threads
+    rather than a ThreadPoolExecutor, which refuses new work and is joined at
+    interpreter exit while locks may still be held.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, float, Callable[[], bool], threading.Event]] = []
+        self._seq = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._tasks: SimpleQueue[tuple[Callable[[], bool], threading.Event]] = SimpleQueue()
+
+    def watch(self, interval_ms: int, renew: Callable[[], bool]) -> threading.Event:
+        """
+        Call renew every interval_ms until the returned event is set or renew
+        returns False.
+        """
+        if interval_ms <= 0:
+            raise ValueError("interval_ms must be positive")
+        stop = threading.Event()
+        interval = interval_ms / 1000
+        with self._cond:
+            if self._thread is None:
+                for i in range(os.cpu_count() or 1):
+                    threading.Thread(
+                        target=self._work, name=f"redis-locker-watchdog-{i}", daemon=True
+                    ).start()
+                self._thread = threading.Thread(
+                    target=self._run, name="redis-locker-watchdog", daemon=True
+                )
+                self._thread.start()
+            heapq.heappush(
+                self._heap, (time.monotonic() + interval, next(self._seq), interval, renew, stop)
+            )
+            self._cond.notify()
+        return stop
+
+    def _run(self) -> None:
+        # An error must not end this thread: renewals would stop process-wide.
+        while True:
+            try:
+                with self._cond:
+                    while not self._heap or self._heap[0][0] > time.monotonic():
+                        self._cond.wait(
+                            self._heap[0][0] - time.monotonic() if self._heap else None
+                        )
+                    due, _, interval, renew, stop = heapq.heappop(self._heap)
+                    if stop.is_set():
+                        continue
+                    heapq.heappush(
+                        self._heap, (due + interval, next(self._seq), interval, renew, stop)
+                    )
+                self._tasks.put((renew, stop))
+            except Exception:
+                logger.exception("Failed to schedule a lock renewal")
+
+    def _work(self) -> None:
+        tasks = self._tasks
+        while True:
+            renew, stop = tasks.get()
+            try:
+                if not stop.is_set() and not renew():
+                    stop.set()
+            except Exception:
+                logger.exception("Failed to renew a lock; retrying at the next interval")
+            # Do not keep the last lock alive while waiting for more work.
+            renew = stop = None
+
+
+_WATCHDOG = _Watchdog()
+
+
 class RedisLock(Protocol):
+    __slots__ = ()
+
     def touch(self, ttl_ms: int) -> bool:
         """
         Extend the lock's time-to-live (TTL) by the specified milliseconds.
@@ -21,15 +261,27 @@ class RedisLock(Protocol):
     @property
     def uuid(self) -> str: ...
 
+    @property
+    def uuid_bytes(self) -> bytes:
+        """The token as stored in Redis."""
+        ...
+
 
 class _RedisLock(RedisLock):
-    def __init__(self, locker: "RedisLocker", key: str, uuid: str):
+    __slots__ = ("_locker", "_key", "_uuid", "_touch_fn", "_release_args")
+
+    def __init__(self, locker: "RedisLocker", key: str, uuid: str | bytes):
         self._locker = locker
         self._key = key
         self._uuid = uuid
+        # Encoded once and shared by every touch and the release.
+        encode = locker._encode
+        redis_key, token = encode(key), encode(uuid)
+        self._touch_fn = locker._touch_bound(redis_key, token)
+        self._release_args = (_RELEASE_TOUCH_SCRIPT, redis_key, token, b"d")
 
     def touch(self, ttl_ms: int) -> bool:
-        return self.locker._touch(self.key, self.uuid, ttl_ms)
+        return self._touch_fn(ttl_ms)
 
     @property
     def key(self) -> str:
@@ -37,7 +289,11 @@ class _RedisLock(RedisLock):
 
     @property
     def uuid(self) -> str:
-        return self._uuid
+        return self._uuid.hex() if isinstance(self._uuid, bytes) else self._uuid
+
+    @property
+    def uuid_bytes(self) -> bytes:
+        return self._uuid if isinstance(self._uuid, bytes) else self._uuid.encode()
 
     @property
     def locker(self) -> "RedisLocker":
@@ -46,70 +302,359 @@ class _RedisLock(RedisLock):
 
 class RedisLocker:
     def __init__(self, redis: Redis):
+        """
+        Share one Redis client, and ideally one locker, across the process:
+        a single client multiplexes all lock traffic over its connection pool.
+        from_url keeps one client per URL for that purpose.
+        """
         self.redis = redis
-        release_script = """
-        if redis.call("get", KEYS[1]) == ARGV[1] then
-            return redis.call("del", KEYS[1])
-        else
-            return 0
-        end
-        """
-        self.__release_script = self.redis.register_script(release_script)
-
-        touch_script = """
-        if redis.call("get", KEYS[1]) == ARGV[1] then
-            return redis.call("pexpire", KEYS[1], ARGV[2])
-        else
-            return 0
-        end
-        """
-        self.__touch_script = self.redis.register_script(touch_script)
-
-    def _acquire(self, key: str, ttl_ms: int, *, uuid: str | None = None) -> str | None:
-        uuid = uuid or str(uuid4())
-        if self.redis.set(name=key, value=uuid, nx=True, px=ttl_ms):
-            return uuid
-        return None
-
-    def _release(self, key: str, uuid: str) -> bool:
-        result = self.__release_script(keys=[key], args=[uuid])
-        return result == 1
-
-    def _touch(self, key: str, uuid: str, ttl_ms: int) -> bool:
-        result = self.__touch_script(keys=[key], args=[uuid, ttl_ms])
-        return result == 1
 
-    @contextmanager
-    def lock(self, key: str, ttl_ms: int) -> Generator[RedisLock]:
-        uuid = self._acquire(key, ttl_ms)
-        if uuid is None:
-            raise RuntimeError("Failed to acquire lock")
+        lockers = _CLIENT_LOCKERS.get(redis)
+        if lockers is None:
+            lockers = _CLIENT_LOCKERS[redis] = WeakSet()
+        lockers.add(self)
+        if len(lockers) == _MAX_LOCKERS_PER_CLIENT + 1:
+            warnings.warn(
+                f"More than {_MAX_LOCKERS_PER_CLIENT} RedisLocker instances share one Redis "
+                "client; create one locker and reuse it instead of one per call",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        # Bound once so the per-operation path skips the attribute lookups.
+        self._execute_command = redis.execute_command
+        encoder = redis.get_encoder()
+        self._encode = encoder.encode
+        # Raw byte tokens halve the payload, but cannot be decoded as text.
+        self._binary_uuids = not encoder.decode_responses
+        self.__keys: dict[str, RedisLockerKey] = {}
+        # Serializes cache misses, so concurrent evictions cannot remove the
+        # same entry twice.
+        self.__keys_lock = threading.Lock()
+        # Fire-and-forget releases of this locker that have not been sent yet.
+        self.__pending_releases: WeakValueDictionary[str, threading.Event] = (
+            WeakValueDictionary()
+        )
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisLocker":
+        """
+        Build a locker on a process-wide client for url. Calls with the same
+        url and client options (passed to Redis.from_url) share one client.
+        """
+        cache_key = (url, tuple(sorted(kwargs.items())))
+        try:
+            hash(cache_key)
+        except TypeError:
+            # Unhashable options such as retry_on_error=[...] are keyed by repr.
+            cache_key = (url, repr(sorted(kwargs.items())))
+        with _URL_CLIENTS_LOCK:
+            redis = _URL_CLIENTS.get(cache_key)
+            if redis is None:
+                redis = _URL_CLIENTS[cache_key] = Redis.from_url(url, **kwargs)
+        return cls(redis)
 
+    def _evalsha(self, script: Script, key: str | bytes, *args):
+        """
+        Run a single-key script with EVALSHA, skipping Script.__call__'s
+        per-call argument rebuilding. Arguments that are already bytes are
+        sent without re-encoding.
+        """
         try:
-            yield _RedisLock(self, key, uuid)
-        finally:
-            self._release(key, uuid)
+            return self._execute_command("EVALSHA", script.sha, 1, key, *args)
+        except NoScriptError:
+            self.redis.script_load(script.script)
+            return self._execute_command("EVALSHA", script.sha, 1, key, *args)
+
+    def _acquire(
+        self, key: str, ttl_ms: int, *, uuid: str | bytes | None = None
+    ) -> tuple[str | bytes, None] | tuple[None, int]:
+        """
+        Try to acquire the lock in a single round-trip.
+        Returns (uuid, None) on success, or (None, pttl_ms) with the remaining
+        TTL of the current holder on contention (-1 if it has no TTL).
+        """
+        uuid = uuid or _new_uuid(self._binary_uuids)
+        pttl = self._evalsha(_ACQUIRE_SCRIPT, key, uuid, ttl_ms)
+        if pttl is None:
+            return uuid, None
+        return None, pttl
+
+    def _release(self, key: str, uuid: str | bytes) -> bool:
+        result = self._evalsha(_RELEASE_TOUCH_SCRIPT, key, uuid, "d")
+        return result is not None
+
+    def _release_later(self, key: str, uuid: str | bytes) -> None:
+        """
+        Queue the release for the shared background thread, which sends
+        queued releases in pipelined batches.
+        """
+        self.__pending_releases[key] = _RELEASER.put(self.redis, key, uuid)
+
+    def _touch(self, key: str, uuid: str | bytes, ttl_ms: int) -> bool:
+        result = self._evalsha(_RELEASE_TOUCH_SCRIPT, key, uuid, ttl_ms)
+        return result is not None
+
+    def _touch_bound(self, key: bytes, uuid: bytes) -> Callable[[int], bool]:
+        """
+        Return a touch function for one held lock, given its already encoded
+        key and token, with everything except the TTL bound up front.
+        """
+        evalsha = self._evalsha
+        args = (_RELEASE_TOUCH_SCRIPT, key, uuid)
+
+        def touch(ttl_ms: int) -> bool:
+            return evalsha(*args, ttl_ms) is not None
+
+        return touch
+
+    def _acquire_within(
+        self, key: str, ttl_ms: int, blocking_ms: int | None
+    ) -> tuple[str | bytes, None] | tuple[None, int]:
+        """
+        Like _acquire, but keep retrying for up to blocking_ms, sleeping for
+        the holder's remaining TTL or _MAX_POLL_MS between attempts, whichever
+        is shorter.
+        """
+        # Taken before acquiring, as the entry disappears once the release is sent.
+        pending = self.__pending_releases.get(key)
+        uuid, pttl = self._acquire(key, ttl_ms)
+        if uuid is None and pending is not None:
+            # This locker's own fire-and-forget release of the key may not have
+            # reached Redis yet; wait for it rather than for the TTL.
+            pending.wait()
+            uuid, pttl = self._acquire(key, ttl_ms)
+        if uuid is not None or blocking_ms is None:
+            return uuid, pttl
+        deadline = time.monotonic() + blocking_ms / 1000
+        while uuid is None:
+            budget_ms = (deadline - time.monotonic()) * 1000
+            if budget_ms <= 0:
+                break
+            poll_ms = _MAX_POLL_MS if pttl < 0 else min(pttl, _MAX_POLL_MS)
+            time.sleep(min(poll_ms, budget_ms) / 1000)
+            uuid, pttl = self._acquire(key, ttl_ms)
+        return uuid, pttl
+
+    def lock(
+        self,
+        key: str,
+        ttl_ms: int,
+        *,
+        blocking_ms: int | None = None,
+        fire_and_forget: bool = False,
+        watchdog_ms: int | None = None,
+    ) -> AbstractContextManager[RedisLock]:
+        """
+        Acquire the lock for the duration of the context.
+        With blocking_ms, retry for up to that many milliseconds, polling every
+        50 ms or when the holder's TTL runs out, whichever comes first.
+        With fire_and_forget, the release is queued to a background thread so
+        leaving the context does not wait for Redis. The key stays held until
+        the release is sent, which this locker waits for when re-locking the
+        same key. Other lockers and processes see it as held meanwhile: they
+        fail without blocking_ms, and with it take the key at most one 50 ms
+        poll after the release is sent.
+        With watchdog_ms, the TTL is reset to ttl_ms every watchdog_ms while
+        the context is active (ttl_ms // 3 is a sensible interval).
+        """
+        return _LockContext(self, key, ttl_ms, blocking_ms, fire_and_forget, watchdog_ms)
+
+    def __call__(
+        self,
+        key: str,
+        ttl_ms: int,
+        *,
+        blocking_ms: int | None = None,
+        fire_and_forget: bool = False,
+        watchdog_ms: int | None = None,
+    ) -> AbstractContextManager[RedisLock]:
+        return _LockContext(self, key, ttl_ms, blocking_ms, fire_and_forget, watchdog_ms)
+
+    def try_lock(
+        self,
+        key: str,
+        ttl_ms: int,
+        *,
+        blocking_ms: int | None = None,
+        fire_and_forget: bool = False,
+        watchdog_ms: int | None = None,
+    ) -> AbstractContextManager[RedisLock | None]:
+        """
+        Like lock, but yield None instead of raising RuntimeError when the lock
+        cannot be acquired, so polling callers avoid the cost of exceptions.
+        """
+        return _LockContext(
+            self, key, ttl_ms, blocking_ms, fire_and_forget, watchdog_ms, raise_on_failure=False
+        )
 
     @contextmanager
-    def __call__(self, key: str, ttl_ms: int) -> Generator[RedisLock]:
-        with self.lock(key, ttl_ms) as lock:
-            yield lock
+    def multi_lock(self, keys: list[str], ttl_ms: int) -> Generator[list[RedisLock]]:
+        """
+        Acquire locks on all keys in a single pipelined round-trip.
+        If any key is already held, the locks that were obtained are released
+        and RuntimeError is raised.
+        """
+        if len(set(keys)) != len(keys):
+            raise ValueError("multi_lock keys must be unique")
+        uuids = [_new_uuid(self._binary_uuids) for _ in keys]
+        pipe = self.redis.pipeline(transaction=False)
+        for key, uuid in zip(keys, uuids):
+            pipe.set(name=key, value=uuid, nx=True, px=ttl_ms)
+        results = pipe.execute()
+
+        acquired = [(key, uuid) for key, uuid, ok in zip(keys, uuids, results) if ok]
+        if len(acquired) < len(keys):
+            if acquired:
+                _release_pipelined(self.redis, acquired)
+            held = [key for key, ok in zip(keys, results) if not ok]
+            raise RuntimeError(f"Failed to acquire locks {held!r}")
+
+        try:
+            yield [_RedisLock(self, key, uuid) for key, uuid in acquired]
+        finally:
+            if acquired:
+                _release_pipelined(self.redis, acquired)
 
     def __getitem__(self, key: str) -> "RedisLockerKey":
-        return RedisLockerKey(self.redis, key)
+        locker_key = self.__keys.get(key)
+        if locker_key is None:
+            with self.__keys_lock:
+                locker_key = self.__keys.get(key)
+                if locker_key is None:
+                    if len(self.__keys) >= _KEY_CACHE_SIZE:
+                        del self.__keys[next(iter(self.__keys))]
+                    locker_key = self.__keys[key] = RedisLockerKey(self, key)
+        return locker_key
+
+
+def _shared_locker(redis: Redis) -> RedisLocker:
+    locker = _SHARED_LOCKERS.get(id(redis))
+    if locker is None:
+        locker = _SHARED_LOCKERS[id(redis)] = RedisLocker(redis)
+    return locker
 
 
 class RedisLockerKey:
-    def __init__(self, redis, key: str):
-        self._locker = RedisLocker(redis)
+    __slots__ = ("_locker", "_key")
+
+    def __init__(self, locker: RedisLocker | Redis, key: str):
+        if not isinstance(locker, RedisLocker):
+            # Any client, including RedisCluster, which does not subclass Redis.
+            locker = _shared_locker(locker)
+        self._locker = locker
         self._key = key
 
-    @contextmanager
-    def lock(self, ttl_ms: int) -> Generator[RedisLock]:
-        with self._locker.lock(self._key, ttl_ms) as lock:
-            yield lock
+    def lock(
+        self,
+        ttl_ms: int,
+        *,
+        blocking_ms: int | None = None,
+        fire_and_forget: bool = False,
+        watchdog_ms: int | None = None,
+    ) -> AbstractContextManager[RedisLock]:
+        return _LockContext(
+            self._locker, self._key, ttl_ms, blocking_ms, fire_and_forget, watchdog_ms
+        )
 
-    @contextmanager
-    def __call__(self, ttl_ms: int) -> Generator[RedisLock]:
-        with self.lock(ttl_ms) as lock:
-            yield lock
+    def __call__(
+        self,
+        ttl_ms: int,
+        *,
+        blocking_ms: int | None = None,
+        fire_and_forget: bool = False,
+        watchdog_ms: int | None = None,
+    ) -> AbstractContextManager[RedisLock]:
+        return _LockContext(
+            self._locker, self._key, ttl_ms, blocking_ms, fire_and_forget, watchdog_ms
+        )
+
+    def try_lock(
+        self,
+        ttl_ms: int,
+        *,
+        blocking_ms: int | None = None,
+        fire_and_forget: bool = False,
+        watchdog_ms: int | None = None,
+    ) -> AbstractContextManager[RedisLock | None]:
+        return _LockContext(
+            self._locker,
+            self._key,
+            ttl_ms,
+            blocking_ms,
+            fire_and_forget,
+            watchdog_ms,
+            raise_on_failure=False,
+        )
+
+
+class _LockContext:
+    """
+    Context manager returned by RedisLocker.lock. Written as a class rather
+    than with @contextmanager to avoid a generator frame per `with`. Like a
+    @contextmanager object, it can be entered only once.
+    """
+
+    __slots__ = (
+        "_locker",
+        "_key",
+        "_ttl_ms",
+        "_blocking_ms",
+        "_fire_and_forget",
+        "_watchdog_ms",
+        "_raise_on_failure",
+        "_entered",
+        "_lock",
+        "_stop_watchdog",
+    )
+
+    def __init__(
+        self,
+        locker: RedisLocker,
+        key: str,
+        ttl_ms: int,
+        blocking_ms: int | None,
+        fire_and_forget: bool,
+        watchdog_ms: int | None,
+        *,
+        raise_on_failure: bool = True,
+    ):
+        if watchdog_ms is not None and not 0 < watchdog_ms < ttl_ms:
+            raise ValueError("watchdog_ms must be positive and less than ttl_ms")
+        self._locker = locker
+        self._key = key
+        self._ttl_ms = ttl_ms
+        self._blocking_ms = blocking_ms
+        self._fire_and_forget = fire_and_forget
+        self._watchdog_ms = watchdog_ms
+        self._raise_on_failure = raise_on_failure
+        self._entered = False
+        self._lock: _RedisLock | None = None
+        self._stop_watchdog: threading.Event | None = None
+
+    def __enter__(self) -> RedisLock | None:
+        if self._entered:
+            raise RuntimeError("A lock context cannot be entered more than once")
+        self._entered = True
+        key, ttl_ms = self._key, self._ttl_ms
+        uuid, pttl = self._locker._acquire_within(key, ttl_ms, self._blocking_ms)
+        if uuid is None:
+            if not self._raise_on_failure:
+                return None
+            raise RuntimeError(f"Failed to acquire lock {key!r} (held for another {pttl} ms)")
+
+        lock = self._lock = _RedisLock(self._locker, key, uuid)
+        if self._watchdog_ms is not None:
+            self._stop_watchdog = _WATCHDOG.watch(self._watchdog_ms, lambda: lock.touch(ttl_ms))
+        return lock
+
+    def __exit__(self, *exc_info) -> None:
+        lock, self._lock = self._lock, None
+        if lock is None:
+            return
+        if self._stop_watchdog is not None:
+            self._stop_watchdog.set()
+            self._stop_watchdog = None
+        if self._fire_and_forget:
+            self._locker._release_later(lock.key, lock._uuid)
+        else:
+            self._locker._evalsha(*lock._release_args)
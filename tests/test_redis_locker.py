@@ -1,16 +1,32 @@
+import asyncio
+import logging
 import os
 import pytest
+import threading
 import time
+import warnings
 from redis import Redis
-from redis_locker import RedisLocker, RedisLockerKey
-from redis_locker._locker import _RedisLock
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from redis.asyncio import ConnectionPool as AsyncConnectionPool, Redis as AsyncRedis
+from redis_locker import AsyncRedisLocker, RedisLocker, RedisLockerKey
+from redis_locker._async_locker import _AsyncRedisLock
+from redis_locker._locker import (
+    _ACQUIRE_SCRIPT,
+    _RELEASER,
+    _RELEASE_TOUCH_SCRIPT,
+    _WATCHDOG,
+    _RedisLock,
+)
+
+
+REDIS_URL = os.getenv("TEST_REDIS", "redis://localhost:6379/0")
 
 
 @pytest.fixture(scope="session")
 def redis_client():
     """実際のRedisクライアントを提供するフィクスチャ"""
-    redis_url = os.getenv("TEST_REDIS", "redis://localhost:6379/0")
-    client = Redis.from_url(redis_url, decode_responses=True)
+    client = Redis.from_url(REDIS_URL, decode_responses=True)
 
     # 接続を確認
     try:
@@ -48,11 +64,62 @@ class TestRedisLocker:
         locker = RedisLocker(redis_client)
         assert locker.redis == redis_client
 
+    def test_init_without_server(self):
+        """Redisに接続できなくてもRedisLockerを作成できることをテスト"""
+        client = Redis(host="127.0.0.1", port=1, retry=Retry(NoBackoff(), 0))
+        locker = RedisLocker(client)
+
+        assert locker.redis is client
+
+    def test_from_url_shares_client(self):
+        """from_urlが同じURLに対してRedisクライアントを共有することをテスト"""
+        locker1 = RedisLocker.from_url(REDIS_URL, decode_responses=True)
+        locker2 = RedisLocker.from_url(REDIS_URL, decode_responses=True)
+        locker3 = RedisLocker.from_url(REDIS_URL)
+
+        assert locker1.redis is locker2.redis
+        assert locker1.redis is not locker3.redis
+
+        with locker1.lock("test_lock_key", 5000) as lock:
+            assert locker2.redis.get("test_lock_key") == lock.uuid
+
+    def test_from_url_unhashable_options(self):
+        """from_urlにハッシュ不可能なオプションを渡せることをテスト"""
+        locker1 = RedisLocker.from_url(REDIS_URL, retry_on_error=[ConnectionError])
+        locker2 = RedisLocker.from_url(REDIS_URL, retry_on_error=[ConnectionError])
+
+        assert locker1.redis is locker2.redis
+
+    def test_warns_when_client_is_overshared(self):
+        """1つのクライアントに多数のRedisLockerが作られた場合に警告することをテスト"""
+        client = Redis.from_url(REDIS_URL, decode_responses=True)
+        lockers = [RedisLocker(client) for _ in range(32)]
+
+        with pytest.warns(RuntimeWarning, match="share one Redis client"):
+            lockers.append(RedisLocker(client))
+        client.close()
+
+    def test_first_use_loads_scripts(self):
+        """初期化時ではなく初回の使用時にLuaスクリプトがロードされることをテスト"""
+        client = Redis.from_url(REDIS_URL, decode_responses=True)
+        client.script_flush()
+        locker = RedisLocker(client)
+        assert client.script_exists(_ACQUIRE_SCRIPT.sha, _RELEASE_TOUCH_SCRIPT.sha) == [False, False]
+
+        with locker.lock("test_lock_key", 5000):
+            pass
+
+        assert client.script_exists(_ACQUIRE_SCRIPT.sha, _RELEASE_TOUCH_SCRIPT.sha) == [True, True]
+        client.close()
+
     def test_acquire_success(self, locker):
         """ロック取得成功のテスト"""
-        uuid = locker._acquire("test_lock_key", 5000)
+        uuid, _ = locker._acquire("test_lock_key", 5000)
 
         assert uuid is not None
+        # ランダムな128ビットの16進文字列
+        assert len(uuid) == 32
+        int(uuid, 16)
         # Redisに実際にキーが設定されていることを確認
         stored_value = locker.redis.get("test_lock_key")
         assert stored_value == uuid
@@ -60,17 +127,34 @@ class TestRedisLocker:
     def test_acquire_failure(self, locker):
         """ロック取得失敗のテスト（すでにロックされている）"""
         # 最初のロックを取得
-        uuid1 = locker._acquire("test_lock_key", 5000)
+        uuid1, _ = locker._acquire("test_lock_key", 5000)
         assert uuid1 is not None
 
         # 同じキーで2回目のロックを試みる（失敗するはず）
-        uuid2 = locker._acquire("test_lock_key", 5000)
+        uuid2, pttl = locker._acquire("test_lock_key", 5000)
         assert uuid2 is None
+        # 保持者の残りTTLが返される
+        assert 0 < pttl <= 5000
+
+    def test_acquire_binary_uuid(self):
+        """decode_responses=Falseのクライアントでは16バイトの生トークンを使うことをテスト"""
+        client = Redis.from_url(REDIS_URL)
+        locker = RedisLocker(client)
+
+        with locker.lock("test_lock_key", 5000) as lock:
+            stored_value = client.get("test_lock_key")
+            assert len(stored_value) == 16
+            assert stored_value == lock.uuid_bytes
+            assert lock.uuid == stored_value.hex()
+            assert lock.touch(10000) is True
+
+        assert client.get("test_lock_key") is None
+        client.close()
 
     def test_acquire_with_custom_uuid(self, locker):
         """カスタムUUIDでのロック取得テスト"""
         custom_uuid = "custom-uuid-12345"
-        uuid = locker._acquire("test_lock_key", 5000, uuid=custom_uuid)
+        uuid, _ = locker._acquire("test_lock_key", 5000, uuid=custom_uuid)
 
         assert uuid == custom_uuid
         stored_value = locker.redis.get("test_lock_key")
@@ -78,7 +162,7 @@ class TestRedisLocker:
 
     def test_acquire_ttl(self, locker, redis_client):
         """ロックのTTLが正しく設定されることをテスト"""
-        uuid = locker._acquire("test_lock_key", 1000)  # 1秒
+        uuid, _ = locker._acquire("test_lock_key", 1000)  # 1秒
         assert uuid is not None
 
         # TTLを確認（ミリ秒単位）
@@ -87,7 +171,7 @@ class TestRedisLocker:
 
     def test_release_success(self, locker):
         """ロック解放成功のテスト"""
-        uuid = locker._acquire("test_lock_key", 5000)
+        uuid, _ = locker._acquire("test_lock_key", 5000)
         assert uuid is not None
 
         result = locker._release("test_lock_key", uuid)
@@ -98,7 +182,7 @@ class TestRedisLocker:
 
     def test_release_failure_wrong_uuid(self, locker):
         """ロック解放失敗のテスト（UUIDが一致しない）"""
-        uuid = locker._acquire("test_lock_key", 5000)
+        uuid, _ = locker._acquire("test_lock_key", 5000)
         assert uuid is not None
 
         # 間違ったUUIDで解放を試みる
@@ -108,6 +192,15 @@ class TestRedisLocker:
         # キーがまだ存在することを確認
         assert locker.redis.get("test_lock_key") == uuid
 
+    def test_release_after_script_flush(self, locker, redis_client):
+        """スクリプトがフラッシュされた後も再ロードして解放できることをテスト"""
+        uuid, _ = locker._acquire("test_lock_key", 5000)
+        assert uuid is not None
+
+        redis_client.script_flush()
+        assert locker._release("test_lock_key", uuid) is True
+        assert redis_client.get("test_lock_key") is None
+
     def test_release_nonexistent_lock(self, locker):
         """存在しないロックの解放テスト"""
         result = locker._release("nonexistent_key", "some-uuid")
@@ -115,7 +208,7 @@ class TestRedisLocker:
 
     def test_touch_success(self, locker, redis_client):
         """ロックのTTL更新成功のテスト"""
-        uuid = locker._acquire("test_lock_key", 1000)
+        uuid, _ = locker._acquire("test_lock_key", 1000)
         assert uuid is not None
 
         # TTLを延長
@@ -128,7 +221,7 @@ class TestRedisLocker:
 
     def test_touch_failure_wrong_uuid(self, locker, redis_client):
         """ロックのTTL更新失敗のテスト（UUIDが一致しない）"""
-        uuid = locker._acquire("test_lock_key", 5000)
+        uuid, _ = locker._acquire("test_lock_key", 5000)
         assert uuid is not None
 
         # 間違ったUUIDでtouchを試みる
@@ -150,6 +243,7 @@ class TestRedisLocker:
             assert isinstance(lock, _RedisLock)
             assert lock.key == "test_lock_key"
             assert lock.uuid is not None
+            assert lock.uuid_bytes == lock.uuid.encode()
 
             # ロック中はキーが存在する
             assert redis_client.get("test_lock_key") == lock.uuid
@@ -160,7 +254,7 @@ class TestRedisLocker:
     def test_lock_context_manager_acquire_failure(self, locker):
         """ロック取得失敗時のテスト"""
         # 最初のロックを取得
-        uuid = locker._acquire("test_lock_key", 5000)
+        uuid, _ = locker._acquire("test_lock_key", 5000)
         assert uuid is not None
 
         # 同じキーでロックを試みる（失敗するはず）
@@ -168,6 +262,114 @@ class TestRedisLocker:
             with locker.lock("test_lock_key", 5000):
                 pass
 
+    def test_lock_context_is_single_use(self, locker, redis_client):
+        """同じコンテキストマネージャを再利用できないことをテスト"""
+        cm = locker.try_lock("test_lock_key", 5000)
+        with cm as lock:
+            with pytest.raises(RuntimeError, match="more than once"):
+                with cm:
+                    pass
+            # 内側の失敗で外側のロックが解放されていない
+            assert redis_client.get("test_lock_key") == lock.uuid
+
+        with pytest.raises(RuntimeError, match="more than once"):
+            with cm:
+                pass
+
+    def test_lock_blocking_waits_for_expiry(self, locker, redis_client):
+        """blocking_ms指定時に保持者のTTL切れを待って取得できることをテスト"""
+        uuid, _ = locker._acquire("test_lock_key", 200)
+        assert uuid is not None
+
+        start = time.monotonic()
+        with locker.lock("test_lock_key", 5000, blocking_ms=1000) as lock:
+            elapsed = time.monotonic() - start
+            assert redis_client.get("test_lock_key") == lock.uuid
+
+        # 残りTTL分だけ待機している
+        assert 0.1 <= elapsed < 1.0
+
+    def test_lock_blocking_notices_early_release(self, locker, redis_client):
+        """blocking_ms指定時にTTL切れより前の解放を待たずに検知できることをテスト"""
+        uuid, _ = locker._acquire("test_lock_key", 5000)
+        assert uuid is not None
+        threading.Timer(0.05, locker._release, ("test_lock_key", uuid)).start()
+
+        start = time.monotonic()
+        with locker.lock("test_lock_key", 5000, blocking_ms=3000):
+            elapsed = time.monotonic() - start
+
+        # 残りTTL（5秒）ではなく解放直後に取得できている
+        assert elapsed < 0.5
+
+    def test_lock_blocking_timeout(self, locker):
+        """blocking_msの予算内に取得できない場合のテスト"""
+        uuid, _ = locker._acquire("test_lock_key", 5000)
+        assert uuid is not None
+
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="Failed to acquire lock"):
+            with locker.lock("test_lock_key", 5000, blocking_ms=200):
+                pass
+
+        assert time.monotonic() - start < 1.0
+
+    def test_lock_fire_and_forget_release(self, locker, redis_client):
+        """fire_and_forget指定時にバックグラウンドでロックが解放されることをテスト"""
+        for _ in range(3):
+            with locker.lock("test_lock_key", 5000, fire_and_forget=True) as lock:
+                assert redis_client.get("test_lock_key") == lock.uuid
+
+            # バックグラウンドスレッドによる解放を待つ
+            deadline = time.monotonic() + 1.0
+            while redis_client.get("test_lock_key") is not None:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+    def test_lock_fire_and_forget_relock_same_key(self, locker):
+        """fire_and_forget直後に同じキーを再ロックしても失敗しないことをテスト"""
+        counter = {"value": 0}
+        for _ in range(50):
+            with locker.lock("test_counter_lock", 5000, fire_and_forget=True):
+                counter["value"] += 1
+
+        assert counter["value"] == 50
+
+    def test_lock_fire_and_forget_shares_one_thread(self, redis_client):
+        """複数のロッカーがバックグラウンドスレッドを1つだけ共有することをテスト"""
+        for i in range(5):
+            with RedisLockerKey(redis_client, f"test_lock_key_{i}")(5000, fire_and_forget=True):
+                pass
+
+        names = [thread.name for thread in threading.enumerate()]
+        assert names.count("redis-locker-release") == 1
+
+    def test_fire_and_forget_failure_is_logged(self, caplog):
+        """バックグラウンドでの解放失敗がログに記録されることをテスト"""
+        client = Redis(host="127.0.0.1", port=1, retry=Retry(NoBackoff(), 0))
+        with caplog.at_level(logging.ERROR, logger="redis_locker._locker"):
+            assert _RELEASER.put(client, "test_lock_key", "some-uuid").wait(5)
+
+        assert "Failed to release 1 lock(s)" in caplog.text
+
+    def test_try_lock(self, locker, redis_client):
+        """try_lockがロック取得失敗時に例外ではなくNoneを返すことをテスト"""
+        with locker.try_lock("test_lock_key", 5000) as lock1:
+            assert lock1 is not None
+            assert redis_client.get("test_lock_key") == lock1.uuid
+
+            with locker.try_lock("test_lock_key", 5000) as lock2:
+                assert lock2 is None
+
+            with locker["test_lock_key"].try_lock(5000) as lock3:
+                assert lock3 is None
+
+            # 取得できなかった側の終了で既存のロックが解放されない
+            assert redis_client.get("test_lock_key") == lock1.uuid
+
+        # ロックが解放されている
+        assert redis_client.get("test_lock_key") is None
+
     def test_lock_context_manager_exception_handling(self, locker, redis_client):
         """コンテキストマネージャー内で例外が発生してもロックが解放されることをテスト"""
         with pytest.raises(ValueError):
@@ -195,6 +397,12 @@ class TestRedisLocker:
 
         assert isinstance(locker_key, RedisLockerKey)
         assert locker_key._key == "test_lock_key"
+        assert locker_key._locker is locker
+
+    def test_getitem_is_memoized(self, locker):
+        """同じキーの__getitem__が同じRedisLockerKeyを返すことをテスト"""
+        assert locker["test_lock_key"] is locker["test_lock_key"]
+        assert locker["test_lock_key"] is not locker["test_other_key"]
 
 
 class TestRedisLock:
@@ -208,9 +416,14 @@ class TestRedisLock:
         assert lock.uuid == "test-uuid-123"
         assert lock.locker == locker
 
+    def test_redis_lock_has_no_dict(self, locker):
+        """_RedisLockとRedisLockerKeyが__slots__を使っていることをテスト"""
+        assert not hasattr(_RedisLock(locker, "test_lock_key", "test-uuid-123"), "__dict__")
+        assert not hasattr(locker["test_lock_key"], "__dict__")
+
     def test_redis_lock_touch(self, locker, redis_client):
         """_RedisLockのtouchメソッドのテスト"""
-        uuid = locker._acquire("test_lock_key", 1000)
+        uuid, _ = locker._acquire("test_lock_key", 1000)
         lock = _RedisLock(locker, "test_lock_key", uuid)
 
         result = lock.touch(5000)
@@ -231,6 +444,22 @@ class TestRedisLockerKey:
         assert locker_key._key == "test_lock_key"
         assert isinstance(locker_key._locker, RedisLocker)
 
+    def test_locker_key_init_shares_locker_per_client(self):
+        """Redisクライアントから作ったRedisLockerKeyが1つのRedisLockerを共有することをテスト"""
+        client = Redis.from_url(REDIS_URL, decode_responses=True)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            locker_keys = [RedisLockerKey(client, f"test_lock_key_{i}") for i in range(40)]
+
+        assert len({id(locker_key._locker) for locker_key in locker_keys}) == 1
+        client.close()
+
+    def test_locker_key_init_with_locker(self, locker):
+        """RedisLockerを渡した場合はそのまま共有されることをテスト"""
+        locker_key = RedisLockerKey(locker, "test_lock_key")
+
+        assert locker_key._locker is locker
+
     def test_locker_key_lock_method(self, redis_client):
         """RedisLockerKeyのlockメソッドのテスト"""
         locker_key = RedisLockerKey(redis_client, "test_lock_key")
@@ -282,6 +511,26 @@ class TestConcurrency:
         with locker.lock("test_lock_key", 5000) as lock2:
             assert lock2.key == "test_lock_key"
 
+    def test_getitem_from_threads(self, locker):
+        """複数スレッドから__getitem__を呼んでもキャッシュの追い出しが競合しないことをテスト"""
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(2000):
+                    locker[f"test_key_{n}_{i}"]
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(locker._RedisLocker__keys) <= 1024
+
     def test_multiple_different_locks(self, locker, redis_client):
         """異なるキーの複数のロックを同時に保持できることをテスト"""
         with locker.lock("test_lock_key_1", 5000) as lock1:
@@ -296,13 +545,48 @@ class TestConcurrency:
                     assert redis_client.get("test_lock_key_2") == lock2.uuid
                     assert redis_client.get("test_lock_key_3") == lock3.uuid
 
+    def test_multi_lock(self, locker, redis_client):
+        """multi_lockで複数のロックを一度に取得・解放できることをテスト"""
+        keys = ["test_lock_key_1", "test_lock_key_2", "test_lock_key_3"]
+        with locker.multi_lock(keys, 5000) as locks:
+            assert [lock.key for lock in locks] == keys
+            for lock in locks:
+                assert redis_client.get(lock.key) == lock.uuid
+
+        # すべてのロックが解放されている
+        assert all(redis_client.get(key) is None for key in keys)
+
+    def test_multi_lock_partial_failure(self, locker, redis_client):
+        """一部のキーが取得済みの場合、取得できたロックが解放されることをテスト"""
+        uuid, _ = locker._acquire("test_lock_key_2", 5000)
+        assert uuid is not None
+
+        keys = ["test_lock_key_1", "test_lock_key_2", "test_lock_key_3"]
+        with pytest.raises(RuntimeError, match="test_lock_key_2"):
+            with locker.multi_lock(keys, 5000):
+                pass
+
+        # 既存のロックはそのまま、他のキーは解放されている
+        assert redis_client.get("test_lock_key_1") is None
+        assert redis_client.get("test_lock_key_2") == uuid
+        assert redis_client.get("test_lock_key_3") is None
+
+    def test_multi_lock_duplicate_keys(self, locker, redis_client):
+        """multi_lockに重複したキーを渡した場合のテスト"""
+        with pytest.raises(ValueError):
+            with locker.multi_lock(["test_lock_key_1", "test_lock_key_1"], 5000):
+                pass
+
+        # ロックは取得されていない
+        assert redis_client.get("test_lock_key_1") is None
+
 
 class TestLockExpiration:
     """ロックの有効期限のテスト"""
 
     def test_lock_expires_after_ttl(self, locker, redis_client):
         """ロックがTTL後に期限切れになることをテスト"""
-        uuid = locker._acquire("test_lock_key", 100)  # 100ms
+        uuid, _ = locker._acquire("test_lock_key", 100)  # 100ms
         assert uuid is not None
 
         # すぐにはキーが存在する
@@ -316,7 +600,7 @@ class TestLockExpiration:
 
     def test_touch_extends_lock_lifetime(self, locker, redis_client):
         """touchがロックの有効期限を延長することをテスト"""
-        uuid = locker._acquire("test_lock_key", 200)  # 200ms
+        uuid, _ = locker._acquire("test_lock_key", 200)  # 200ms
         assert uuid is not None
 
         # 100ms待機
@@ -333,6 +617,54 @@ class TestLockExpiration:
         time.sleep(0.4)  # さらに400ms（合計650ms）
         assert redis_client.get("test_lock_key") is None
 
+    def test_watchdog_keeps_lock_alive(self, locker, redis_client):
+        """watchdog_ms指定時にロックが自動的に延長されることをテスト"""
+        with locker.lock("test_lock_key", 200, watchdog_ms=50) as lock:
+            # 元のTTLを大きく過ぎても保持されている
+            time.sleep(0.5)
+            assert redis_client.get("test_lock_key") == lock.uuid
+
+        # コンテキストを抜けた後、ロックが解放されている
+        assert redis_client.get("test_lock_key") is None
+
+    def test_watchdog_stops_after_release(self, locker, redis_client):
+        """解放後はwatchdogが別の保持者のロックを延長しないことをテスト"""
+        with locker.lock("test_lock_key", 200, watchdog_ms=50):
+            pass
+
+        uuid, _ = locker._acquire("test_lock_key", 200)
+        assert uuid is not None
+        time.sleep(0.3)
+        assert redis_client.get("test_lock_key") is None
+
+    def test_watchdog_survives_renewal_errors(self, caplog):
+        """延長処理が例外を送出してもwatchdogが延長を続けることをテスト"""
+        calls = []
+
+        def renew():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise ConnectionError("test")
+            return len(calls) < 3
+
+        with caplog.at_level(logging.ERROR, logger="redis_locker._locker"):
+            stop = _WATCHDOG.watch(20, renew)
+            assert stop.wait(5)
+
+        assert len(calls) == 3
+        assert "Failed to renew a lock" in caplog.text
+        assert _WATCHDOG._thread.is_alive()
+
+    @pytest.mark.parametrize("watchdog_ms", [0, -1, 200, 500])
+    def test_watchdog_invalid_interval(self, locker, redis_client, watchdog_ms):
+        """watchdog_msが0以下またはttl_ms以上の場合のテスト"""
+        with pytest.raises(ValueError):
+            with locker.lock("test_lock_key", 200, watchdog_ms=watchdog_ms):
+                pass
+
+        # ロックは取得されていない
+        assert redis_client.get("test_lock_key") is None
+
 
 class TestIntegration:
     """統合テスト"""
@@ -384,3 +716,97 @@ class TestIntegration:
         # locker1のロックが解放された後は、locker2でロック可能
         with locker2.lock("test_shared_lock", 5000) as lock2:
             assert lock2.key == "test_shared_lock"
+
+
+class TestAsyncRedisLocker:
+    """AsyncRedisLockerクラスのテスト"""
+
+    def test_lock_context_manager_success(self, redis_client):
+        """非同期ロックのコンテキストマネージャー（成功）のテスト"""
+
+        async def main():
+            locker = AsyncRedisLocker(AsyncRedis.from_url(REDIS_URL, decode_responses=True))
+            async with locker.lock("test_lock_key", 5000) as lock:
+                assert isinstance(lock, _AsyncRedisLock)
+                assert redis_client.get("test_lock_key") == lock.uuid
+                assert await lock.touch(10000) is True
+                assert 9900 <= redis_client.pttl("test_lock_key") <= 10000
+            await locker.redis.aclose()
+
+        asyncio.run(main())
+
+        # コンテキストを抜けた後、ロックが解放されている
+        assert redis_client.get("test_lock_key") is None
+
+    def test_lock_acquire_failure(self, redis_client):
+        """非同期ロック取得失敗時のテスト"""
+
+        async def main():
+            pool = AsyncConnectionPool.from_url(REDIS_URL, decode_responses=True)
+            locker = AsyncRedisLocker(connection_pool=pool)
+            async with locker("test_lock_key", 5000):
+                with pytest.raises(RuntimeError, match="Failed to acquire lock"):
+                    async with locker("test_lock_key", 5000):
+                        pass
+            await pool.aclose()
+
+        asyncio.run(main())
+
+    def test_concurrent_tasks_serialize(self, redis_client):
+        """複数タスクがblocking_msで順番にロックを取得できることをテスト"""
+
+        async def main():
+            pool = AsyncConnectionPool.from_url(REDIS_URL, decode_responses=True)
+            locker = AsyncRedisLocker(connection_pool=pool)
+            order = []
+
+            async def worker(i):
+                async with locker.lock("test_lock_key", 100, blocking_ms=2000):
+                    order.append(i)
+                    # 他のタスクは保持者の残りTTL分だけ待機してから再試行する
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(*(worker(i) for i in range(3)))
+            await pool.aclose()
+            return order
+
+        assert sorted(asyncio.run(main())) == [0, 1, 2]
+
+    def test_try_lock(self, redis_client):
+        """非同期try_lockがロック取得失敗時にNoneを返すことをテスト"""
+
+        async def main():
+            locker = AsyncRedisLocker(AsyncRedis.from_url(REDIS_URL, decode_responses=True))
+            async with locker.try_lock("test_lock_key", 5000) as lock1:
+                assert lock1 is not None
+                async with locker.try_lock("test_lock_key", 5000) as lock2:
+                    assert lock2 is None
+                assert redis_client.get("test_lock_key") == lock1.uuid
+            await locker.redis.aclose()
+
+        asyncio.run(main())
+
+        assert redis_client.get("test_lock_key") is None
+
+    def test_lock_binary_uuid(self, redis_client):
+        """decode_responses=Falseの非同期クライアントで生トークンのロックを延長できることをテスト"""
+
+        async def main():
+            locker = AsyncRedisLocker(AsyncRedis.from_url(REDIS_URL))
+            async with locker.lock("test_lock_key", 5000) as lock:
+                stored_value = await locker.redis.get("test_lock_key")
+                assert len(stored_value) == 16
+                assert stored_value == lock.uuid_bytes
+                assert lock.uuid == stored_value.hex()
+                assert await lock.touch(10000) is True
+                assert 9900 <= await locker.redis.pttl("test_lock_key") <= 10000
+            await locker.redis.aclose()
+
+        asyncio.run(main())
+
+        assert redis_client.get("test_lock_key") is None
+
+    def test_init_requires_client_or_pool(self):
+        """redisもconnection_poolも渡さない場合のテスト"""
+        with pytest.raises(ValueError):
+            AsyncRedisLocker()